@@ -0,0 +1,120 @@
+"""
+  File    : test_wlabel.py
+  Brief   : Tests for wlabel.py
+  Author  : Martin Rizzo | <martinrizzo@gmail.com>
+  License : MIT
+- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  Run from this directory with:  python -m unittest test_wlabel
+"""
+import io
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import contextlib
+import unittest.mock
+import wlabel
+
+DEMO_IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'demo_images')
+
+
+TOP_LEVEL_GROUPS = [{"title": "Top Level", "bounding": [0, 0, 100, 100]}]
+NESTED_GROUPS    = [{"title": "Nested"   , "bounding": [0, 0, 100, 100]}]
+
+
+class TestGetWorkflowGroups(unittest.TestCase):
+
+    def test_top_level_groups(self):
+        workflow_json = json.dumps({"last_node_id": 1,
+                                    "groups"      : TOP_LEVEL_GROUPS,
+                                    "nodes"       : []})
+        self.assertEqual(wlabel.get_workflow_groups(workflow_json), TOP_LEVEL_GROUPS)
+
+    def test_nested_groups_before_top_level_groups(self):
+        workflow_json = json.dumps({"extra" : {"subgraph": {"groups": NESTED_GROUPS,
+                                                            "nodes" : []}},
+                                    "groups": TOP_LEVEL_GROUPS,
+                                    "links" : []})
+        self.assertEqual(wlabel.get_workflow_groups(workflow_json), TOP_LEVEL_GROUPS)
+
+    def test_nested_groups_without_top_level_groups(self):
+        workflow_json = json.dumps({"extra": {"subgraph": {"groups": NESTED_GROUPS,
+                                                           "nodes" : []}},
+                                    "nodes": []})
+        self.assertEqual(wlabel.get_workflow_groups(workflow_json), [])
+
+    def test_groups_inside_strings(self):
+        workflow_json = json.dumps({"extra" : {"note": '"groups": [{"title": "Text"}], "nodes": []'},
+                                    "groups": TOP_LEVEL_GROUPS,
+                                    "nodes" : []})
+        self.assertEqual(wlabel.get_workflow_groups(workflow_json), TOP_LEVEL_GROUPS)
+
+    def test_workflow_name_ignores_nested_groups(self):
+        workflow_json = json.dumps({"extra" : {"subgraph": {"groups": NESTED_GROUPS,
+                                                            "nodes" : []}},
+                                    "groups": TOP_LEVEL_GROUPS,
+                                    "nodes" : []})
+        self.assertEqual(wlabel.get_workflow_name(workflow_json), "Top Level")
+
+
+class TestAddLabelToImage(unittest.TestCase):
+
+    def get_label_words(self, text: str) -> tuple:
+        """Returns the two words that `add_label_to_image` draws for a text."""
+        with unittest.mock.patch.object(wlabel, 'draw_two_word_label') as draw_two_word_label:
+            wlabel.add_label_to_image(None, text, None, None)
+        args = draw_two_word_label.call_args.args
+        return args[3], args[6]
+
+    def test_two_words(self):
+        self.assertEqual(self.get_label_words("Abominable_PHOTO"), ("Abominable", "PHOTO"))
+
+    def test_single_word(self):
+        self.assertEqual(self.get_label_words("Abominable"), ("Abominable", "???"))
+
+    def test_empty_text(self):
+        self.assertEqual(self.get_label_words(""), ("???", "???"))
+
+
+class TestProcessAllImages(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_dir = os.getcwd()
+        self.temp_dir     = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        os.mkdir('d1')
+        os.mkdir('d2')
+        shutil.copy(os.path.join(DEMO_IMAGES_DIR, 'demo_INK_1.png'  ), os.path.join('d1', 'x.png'))
+        shutil.copy(os.path.join(DEMO_IMAGES_DIR, 'demo_PHOTO_1.png'), os.path.join('d2', 'x.png'))
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        shutil.rmtree(self.temp_dir)
+
+    def process_all_images(self, image_paths: list) -> list:
+        """Runs `process_all_images` and returns the reported lines."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            wlabel.process_all_images(image_paths, wlabel.DEFAULT_FONT_SIZE)
+        return output.getvalue().splitlines()
+
+    def read_bytes(self, filepath: str) -> bytes:
+        with open(filepath, 'rb') as f:
+            return f.read()
+
+    def test_repeated_path(self):
+        image_path = os.path.join('d1', 'x.png')
+        lines = self.process_all_images([image_path, os.path.abspath(image_path), image_path])
+        self.assertEqual(lines, [" Labeled: labeled_x.png"])
+
+    def test_same_basename(self):
+        # the last image is the one that ends up in the output file
+        wlabel.label_image_file(os.path.join('d2', 'x.png'), 'expected.png', wlabel.DEFAULT_FONT_SIZE)
+        lines = self.process_all_images([os.path.join('d1', 'x.png'), os.path.join('d2', 'x.png')])
+        self.assertEqual(lines, [" Labeled: labeled_x.png"])
+        self.assertEqual(self.read_bytes('labeled_x.png'), self.read_bytes('expected.png'))
+
+
+if __name__ == '__main__':
+    unittest.main()
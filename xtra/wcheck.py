@@ -2,6 +2,8 @@ import os
 import sys
 import json
 import argparse
+import collections
+from concurrent.futures import ThreadPoolExecutor
 try:
     # PIL is used to read workflow data embedded in images
     from PIL import Image
@@ -9,6 +11,12 @@ try:
 except ImportError:
     print("Warning: The Pillow library is not installed: functionality will be limited.")
     PIL_AVAILABLE = False
+try:
+    # orjson is used (when available) to speed up parsing JSON workflows
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # ANSI escape codes for colored terminal output
@@ -28,46 +36,6 @@ def is_terminal_output():
     """Check if the standard output is connected to a terminal."""
     return sys.stdout.isatty()
 
-def get_unpinned_nodes(workflow: dict) -> (list, int):
-    """Extracts unpinned nodes from a workflow
-
-    This function extracts all nodes that are not pinned.
-
-    Args:
-        workflow (dict): A dictionary representing a workflow.
-
-    Returns:
-        list: A list of unpinned nodes, each represented as a namedtuple
-              with 'name', 'x', and 'y' attributes.
-    """
-    unpinned_nodes = []
-
-    nodes = workflow.get('nodes')
-    if not nodes:
-        return []
-
-    for node in nodes:
-        title       = node.get('title', node.get('type', '?'))
-        flags       = node.get('flags')
-        pinned_flag = flags and flags.get('pinned')
-        position    = node.get('pos')
-
-        # extract 'x' and 'y' coordinates
-        # the coordinates can be located using 'app.canvas.canvas_mouse'
-        x, y = 0, 0
-        if isinstance(position, list):
-            x, y = position[0], position[1]
-        elif isinstance(position, dict):
-            x = position.get('0', x)
-            y = position.get('1', y)
-
-        # append unpinned nodes
-        if not pinned_flag:
-            unpinned_node = type('Node', (), {'name': title, 'x': x, 'y': y})
-            unpinned_nodes.append(unpinned_node)
-
-    return unpinned_nodes, len(nodes)
-
 def is_two_element_array_like(data):
     """Checks if the input data is a two-element array-like structure
 
@@ -88,36 +56,62 @@ def is_two_element_array_like(data):
     else:
         return False
 
-def check_node_dimensions(workflow):
-    """Checks if the 'pos' and 'size' node attr are valid two element array-like structures
+# Unpinned node reported by `scan_nodes`
+Node = collections.namedtuple('Node', ('name', 'x', 'y'))
+
+def scan_nodes(workflow: dict) -> tuple:
+    """Scans all nodes of a workflow looking for unpinned nodes and invalid dimensions
 
-    This function iterates through the 'nodes' in a given workflow and checks
-    if the 'pos' and 'size' attributes of each node are valid two element
-    array-like structures.
+    This function walks the 'nodes' of the workflow only once, extracting all
+    nodes that are not pinned and checking if the 'pos' and 'size' attributes
+    of each node are valid two element array-like structures.
 
     Args:
-        workflow: The workflow dictionary containing the 'nodes' list.
+        workflow (dict): A dictionary representing a workflow.
 
     Returns:
-        A tuple containing the number of nodes with invalid 'pos' and 'size'
-        attributes, respectively.
+        A tuple containing:
+          - A list of unpinned nodes, each represented as a namedtuple
+            with 'name', 'x', and 'y' attributes.
+          - The total number of nodes in the workflow.
+          - The number of nodes with invalid 'pos' attribute.
+          - The number of nodes with invalid 'size' attribute.
     """
+    unpinned_nodes = []
     pos_bug_count  = 0
     size_bug_count = 0
 
     nodes = workflow.get('nodes')
     if not nodes:
-        return None
+        return [], 0, 0, 0
 
     for node in nodes:
-        pos  = node.get('pos')
-        size = node.get('size')
-        if pos and not is_two_element_array_like(pos):
+        get         = node.get
+        flags       = get('flags')
+        pinned_flag = flags and flags.get('pinned')
+        position    = get('pos')
+        size        = get('size')
+
+        # check the node dimensions
+        if position and not is_two_element_array_like(position):
             pos_bug_count += 1
         if size and not is_two_element_array_like(size):
             size_bug_count += 1
 
-    return pos_bug_count, size_bug_count
+        # append unpinned nodes
+        if not pinned_flag:
+            # extract 'x' and 'y' coordinates
+            # the coordinates can be located using 'app.canvas.canvas_mouse'
+            x, y = 0, 0
+            if isinstance(position, list):
+                x, y = position[0], position[1]
+            elif isinstance(position, dict):
+                x = position.get('0', x)
+                y = position.get('1', y)
+            title = get('title', get('type', '?'))
+            unpinned_nodes.append( Node(title, x, y) )
+
+    return unpinned_nodes, len(nodes), pos_bug_count, size_bug_count
 
 
 def get_workflow_view(workflow):
@@ -133,6 +127,18 @@ def get_workflow_view(workflow):
 
 #---------------------------- READING WORKFLOW -----------------------------#
 
+def parse_json(json_text):
+    """Parses a JSON document, using orjson when it's available.
+    Args:
+        json_text (str|bytes): The JSON document to parse.
+    Returns:
+        The parsed JSON data.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(json_text)
+    return json.loads(json_text)
+
+
 def read_workflow_from_json(filename: str) -> dict:
     """Reads workflow data from a JSON file
     Args:
@@ -143,8 +149,8 @@ def read_workflow_from_json(filename: str) -> dict:
     """
     try:
         workflow = None
-        with open(filename, 'r') as f:
-            workflow = json.load(f)
+        with open(filename, 'rb') as f:
+            workflow = parse_json(f.read())
         return workflow
     except (FileNotFoundError, IOError, json.JSONDecodeError):
         return None
@@ -165,11 +171,28 @@ def read_workflow_from_png(filename: str) -> dict:
         with Image.open(filename) as image:
             if 'prompt' in image.info and 'workflow' in image.info:
                 workflow = image.info.get('workflow')
-        return json.loads(workflow) if isinstance(workflow,str) else None
+        return parse_json(workflow) if isinstance(workflow,str) else None
     except (IOError, OSError):
         return None
 
 
+def read_workflow(filename: str) -> dict:
+    """Reads workflow data from a JSON file or a PNG image (based on its extension)
+    Args:
+        filename (str): The path to the file.
+    Returns:
+        A dictionary containing the workflow data,
+        or None if no workflow data is found.
+    """
+    _, extension = os.path.splitext(filename)
+    if extension.lower() == '.json':
+        return read_workflow_from_json(filename)
+    elif extension.lower() == '.png':
+        return read_workflow_from_png(filename)
+    else:
+        return None
+
+
 #===========================================================================#
 #////////////////////////////////// MAIN ///////////////////////////////////#
 #===========================================================================#
@@ -190,44 +213,38 @@ def main():
     if not use_color:
         disable_colors()
 
-    for filename in args.workflow_file:
-        print()
-        print(filename)
-
-        _, extension = os.path.splitext(filename)
-        if extension.lower() == '.json':
-            workflow = read_workflow_from_json(filename)
-        elif extension.lower() == '.png':
-            workflow = read_workflow_from_png(filename)
-        else:
-            workflow = None
+    # the files are read concurrently while the results are printed in order
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        workflows = executor.map(read_workflow, args.workflow_file)
 
-        if not workflow:
-            print(f"{YELLOW} - Imposible leer el workflow del archivo.{DEFAULT_COLOR}")
-            continue
+        for filename, workflow in zip(args.workflow_file, workflows):
+            print()
+            print(filename)
 
-        unpinned_nodes, total_count   = get_unpinned_nodes(workflow)
-        pos_bug_count, size_bug_count = check_node_dimensions(workflow);
-        view_x, view_y, view_scale    = get_workflow_view(workflow)
-        view_displaced = view_x != 0 or view_y != 0 or view_scale != 1
+            if not workflow:
+                print(f"{YELLOW} - Imposible leer el workflow del archivo.{DEFAULT_COLOR}")
+                continue
 
-        if not unpinned_nodes and not view_displaced:
-            print(f"{GREEN}  - The {total_count} nodes are pinned and view is at the origin.{DEFAULT_COLOR}")
+            unpinned_nodes, total_count, pos_bug_count, size_bug_count = scan_nodes(workflow)
+            view_x, view_y, view_scale    = get_workflow_view(workflow)
+            view_displaced = view_x != 0 or view_y != 0 or view_scale != 1
 
-        if pos_bug_count > 0:
-            print(f"{RED}  - Potential issues with 'pos' attribute : {pos_bug_count}{DEFAULT_COLOR}")
-        if size_bug_count > 0:
-            print(f"{RED}  - Potential issues with 'size' attribute: {size_bug_count}{DEFAULT_COLOR}")
+            if not unpinned_nodes and not view_displaced:
+                print(f"{GREEN}  - The {total_count} nodes are pinned and view is at the origin.{DEFAULT_COLOR}")
 
-        if view_displaced:
-            print(f"{RED} - The view is not at the origin.{DEFAULT_COLOR}")
+            if pos_bug_count > 0:
+                print(f"{RED}  - Potential issues with 'pos' attribute : {pos_bug_count}{DEFAULT_COLOR}")
+            if size_bug_count > 0:
+                print(f"{RED}  - Potential issues with 'size' attribute: {size_bug_count}{DEFAULT_COLOR}")
 
-        if unpinned_nodes:
-            print(f"{RED}  - Found {len(unpinned_nodes)} unpinned nodes:{DEFAULT_COLOR}")
-            for node in unpinned_nodes:
-                #print(f"       {node.name}  ({node.x}, {node.y})")
-                print(f"       ({node.x:>4},{node.y:>4}) {node.name}")
+            if view_displaced:
+                print(f"{RED} - The view is not at the origin.{DEFAULT_COLOR}")
 
+            if unpinned_nodes:
+                print(f"{RED}  - Found {len(unpinned_nodes)} unpinned nodes:{DEFAULT_COLOR}")
+                for node in unpinned_nodes:
+                    #print(f"       {node.name}  ({node.x}, {node.y})")
+                    print(f"       ({node.x:>4},{node.y:>4}) {node.name}")
     print()
 
 if __name__ == '__main__':
@@ -32,11 +32,23 @@
 _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _
 """
 import os
+import re
 import sys
 import json
+import struct
+import weakref
 import argparse
+import functools
+import collections
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageDraw, ImageFont
 from PIL.PngImagePlugin import PngInfo
+try:
+    # orjson is used (when available) to speed up parsing JSON workflows
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # ANSI escape codes for colored terminal output
 RED    = '\033[91m'
@@ -45,6 +57,10 @@ YELLOW = '\033[93m'
 CYAN   = '\033[96m'
 DEFAULT_COLOR = '\033[0m'
 
+# Disable colors when stderr is not a terminal or NO_COLOR is set
+if not sys.stderr.isatty() or os.environ.get('NO_COLOR'):
+    RED = GREEN = YELLOW = CYAN = DEFAULT_COLOR = ''
+
 # Default height value used for an abominable image
 DEFAULT_ABOMINABLE_HEIGHT = 1536
 
@@ -56,9 +72,34 @@ DEFAULT_LABEL_HEIGHT = 64
 # Color used for prompt text
 PROMPT_TEXT_COLOR = "#333344"
 
+# zlib compression level used when saving PNG images (0-9),
+# higher levels are much slower for a very small reduction in size
+DEFAULT_PNG_COMPRESS_LEVEL = 6
+
+# Separators used to split the label text into words (in order of priority)
+LABEL_WORD_SEPARATORS = (' ', '_', '-')
+
+# Number of processed images reported to stdout with a single write
+REPORT_BATCH_SIZE = 16
+
 # Flag to display a warning if a font fails to load
 SHOW_FONT_WARNING = True
 
+# Metrics calculated for each font, they are computed only once per font object
+# (fonts are cached and reused between images, see `get_all_required_fonts`)
+FONT_METRICS_CACHE    = weakref.WeakKeyDictionary()
+FONT_UNIT_WIDTH_CACHE = weakref.WeakKeyDictionary()
+TEXT_LENGTHS_CACHE    = weakref.WeakKeyDictionary()
+
+# Regex matching the 'groups' array of a workflow followed by another top-level key,
+# it allows parsing only that array when the rest of the workflow is not needed
+GROUPS_ARRAY_REGEX = re.compile(
+    r'"groups"\s*:\s*(\[.*?\])\s*,\s*"(?:nodes|links|config|extra|version|last_node_id|last_link_id)"',
+    re.DOTALL)
+
+# Regex matching a JSON string, used to ignore the brackets inside strings
+JSON_STRING_REGEX = re.compile(r'"(?:[^"\\]|\\.)*"')
+
 # Hex color codes mapped to specific words for visual presentation
 COLORS_BY_WORD = {
     "PHOTO"     : "#dd2525", # Red
@@ -70,32 +111,41 @@ COLORS_BY_WORD = {
     "WORKFLOW"  : "#dd2525", # - Red
     "WORKFLOWS" : "#dd2525", # - Red
 }
+# Same colors indexed by the word in lowercase, for case-insensitive lookups
+COLORS_BY_LOWERCASE_WORD = {word.lower(): color for word, color in COLORS_BY_WORD.items()}
 def get_word_color(word: str, default_color: str=None) -> str:
-    return COLORS_BY_WORD.get(word.upper(), default_color)
+    return COLORS_BY_LOWERCASE_WORD.get(word.lower(), default_color) if word else default_color
 
 
 #----------------------------- ERROR MESSAGES ------------------------------#
 
+# Colored prefixes used by the message functions,
+# precomputed to avoid composing them on each call
+MESSAGE_PREFIX      = f"  {GREEN}>{DEFAULT_COLOR} "
+WARNING_PREFIX      = f"{CYAN}[{YELLOW}WARNING{CYAN}]{YELLOW} "
+WARNING_INFO_PREFIX = f"          {YELLOW}"
+ERROR_PREFIX        = f"{CYAN}[{RED}ERROR{CYAN}]{RED} "
+ERROR_INFO_PREFIX   = f"          {RED}"
+FATAL_INFO_PREFIX   = f" {CYAN}\u24d8  "
+
 def message(text: str) -> None:
     """Displays and logs a regular message to the standard error stream.
     """
-    print(f"  {GREEN}>{DEFAULT_COLOR} {text}", file=sys.stderr)
+    sys.stderr.write(MESSAGE_PREFIX + text + "\n")
 
 def warning(message: str, *info_messages: str) -> None:
     """Displays and logs a warning message to the standard error stream.
     """
-    print(f"{CYAN}[{YELLOW}WARNING{CYAN}]{YELLOW} {message}{DEFAULT_COLOR}", file=sys.stderr)
-    for info_message in info_messages:
-        print(f"          {YELLOW}{info_message}{DEFAULT_COLOR}", file=sys.stderr)
-    print()
+    lines = [WARNING_PREFIX + message + DEFAULT_COLOR]
+    lines.extend(WARNING_INFO_PREFIX + info_message + DEFAULT_COLOR for info_message in info_messages)
+    sys.stderr.write("\n".join(lines) + "\n\n")
 
 def error(message: str, *info_messages: str) -> None:
     """Displays and logs an error message to the standard error stream.
     """
-    print(f"{CYAN}[{RED}ERROR{CYAN}]{RED} {message}{DEFAULT_COLOR}", file=sys.stderr)
-    for info_message in info_messages:
-        print(f"          {RED}{info_message}{DEFAULT_COLOR}", file=sys.stderr)
-    print()
+    lines = [ERROR_PREFIX + message + DEFAULT_COLOR]
+    lines.extend(ERROR_INFO_PREFIX + info_message + DEFAULT_COLOR for info_message in info_messages)
+    sys.stderr.write("\n".join(lines) + "\n\n")
 
 def fatal_error(message: str, *info_messages: str) -> None:
     """Displays and logs an fatal error to the standard error stream and exits.
@@ -103,30 +153,91 @@ def fatal_error(message: str, *info_messages: str) -> None:
         message       : The fatal error message to display.
         *info_messages: Optional informational messages to display after the error.
     """
-    error(message)
-    for info_message in info_messages:
-        print(f" {CYAN}\u24d8  {info_message}{DEFAULT_COLOR}", file=sys.stderr)
+    lines = [ERROR_PREFIX + message + DEFAULT_COLOR, ""]
+    lines.extend(FATAL_INFO_PREFIX + info_message + DEFAULT_COLOR for info_message in info_messages)
+    sys.stderr.write("\n".join(lines) + "\n")
     exit(1)
 
 
 #--------------------------------- HELPERS ---------------------------------#
 
+def has_workflow_chunk(filepath: str) -> bool:
+    """Checks if a PNG file contains a text chunk with the 'workflow' keyword.
+
+    Only the chunk headers are read, so it is much faster than opening
+    the image with PIL (which decodes the whole image to find its texts).
+
+    Args:
+        filepath (str): The path to the image file.
+    Returns:
+        False if the file is a PNG image without a 'workflow' text chunk,
+        True otherwise (including files that are not PNG images).
+    """
+    with open(filepath, 'rb') as f:
+        if f.read(8) != b'\x89PNG\r\n\x1a\n':
+            return True
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return False
+            length, chunk_type = struct.unpack('>I4s', header)
+            if chunk_type in (b'tEXt', b'zTXt', b'iTXt') and length >= 9:
+                if f.read(9) == b'workflow\0':
+                    return True
+                f.seek(length - 9 + 4, 1) # skip the rest of the data and the CRC
+            elif chunk_type == b'IEND':
+                return False
+            else:
+                f.seek(length + 4, 1)     # skip the data and the CRC
+
+
 def find_images_in_dir(directory: str) -> list[str]:
     """Find all PNG image files in a given directory.
     """
     images = []
-    for file_name in os.listdir(directory):
-        file_path = os.path.join(directory, file_name)
-        if os.path.isfile(file_path) and file_name.lower().endswith('.png'):
-            images.append(file_path)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith('.png') and entry.is_file():
+                images.append(os.path.join(directory, entry.name))
     return images
 
 
+def get_font_metrics(font: ImageFont) -> tuple[int, int]:
+    """Returns the ascent and descent of a font (cached version of `font.getmetrics()`).
+    """
+    metrics = FONT_METRICS_CACHE.get(font)
+    if metrics is None:
+        metrics = FONT_METRICS_CACHE[font] = font.getmetrics()
+    return metrics
+
+
+def get_font_unit_width(font: ImageFont) -> float:
+    """Returns the width of the letter 'm' in the given font (cached).
+    """
+    unit_width = FONT_UNIT_WIDTH_CACHE.get(font)
+    if unit_width is None:
+        left, _, right, _ = font.getbbox('m')
+        unit_width = FONT_UNIT_WIDTH_CACHE[font] = right - left
+    return unit_width
+
+
+def get_text_length(font: ImageFont, text: str) -> float:
+    """Returns the length of a text rendered with the given font (cached version of `font.getlength(text)`).
+    """
+    text_lengths = TEXT_LENGTHS_CACHE.get(font)
+    if text_lengths is None:
+        text_lengths = TEXT_LENGTHS_CACHE[font] = {}
+    length = text_lengths.get(text)
+    if length is None:
+        length = text_lengths[text] = font.getlength(text)
+    return length
+
+
 def ascent_diference(font1: ImageFont, font2: ImageFont) -> int:
     """Calculates the difference in ascent between two fonts.
     """
-    ascent1, _ = font1.getmetrics()
-    ascent2, _ = font2.getmetrics()
+    ascent1, _ = get_font_metrics(font1)
+    ascent2, _ = get_font_metrics(font2)
     return ascent1 - ascent2
 
 
@@ -226,6 +337,18 @@ def get_abominable_scale(image: Image) -> float:
     return image_height/DEFAULT_ABOMINABLE_HEIGHT
 
 
+def parse_json(json_text):
+    """Parses a JSON document, using orjson when it's available.
+    Args:
+        json_text (str|bytes): The JSON document to parse.
+    Returns:
+        The parsed JSON data.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(json_text)
+    return json.loads(json_text)
+
+
 def filter_words(words: list) -> list:
     """Removes words from a list that do not start with an alphanumeric character.
     Args:
@@ -240,6 +363,44 @@ def filter_words(words: list) -> list:
     return filtered_words
 
 
+def get_json_depth(json_text: str, position: int) -> int:
+    """Returns the nesting depth of a position in a JSON text.
+    Args:
+        json_text (str): The JSON text.
+        position  (int): The position, it must not be inside a string.
+    Returns:
+        The number of objects and arrays that contain the position.
+    """
+    prefix = JSON_STRING_REGEX.sub('', json_text[:position])
+    return prefix.count('{') + prefix.count('[') - prefix.count('}') - prefix.count(']')
+
+
+def get_workflow_groups(workflow_json: str) -> list:
+    """Extracts the list of groups from a JSON string without parsing the whole workflow.
+
+    Only the 'groups' array is parsed when it can be located in the JSON text,
+    otherwise the whole workflow is parsed.
+
+    Args:
+        workflow_json (str): A JSON string containing workflow data.
+    Returns:
+        The list of groups in the workflow.
+    """
+    # nested objects (e.g. subgraphs) can have their own 'groups' key,
+    # so only a match directly inside the top-level object is accepted
+    for match in GROUPS_ARRAY_REGEX.finditer(workflow_json):
+        if get_json_depth(workflow_json, match.start()) != 1:
+            continue
+        try:
+            groups = parse_json(match.group(1))
+            if isinstance(groups, list):
+                return groups
+        except ValueError:
+            pass
+        break
+    return parse_json(workflow_json).get('groups', [])
+
+
 def get_workflow_name(workflow_json: str) -> str:
     """Extracts the workflow name from a JSON
     Args:
@@ -251,8 +412,7 @@ def get_workflow_name(workflow_json: str) -> str:
         name          = 'abominable workflow'
         name_distance = 100000
 
-        workflow = json.loads(workflow_json)
-        groups = workflow.get('groups', [])
+        groups = get_workflow_groups(workflow_json)
         for group in groups:
             title    = group.get('title')
             bounding = group.get('bounding')
@@ -280,7 +440,7 @@ def get_prompt_text(workflow_json: str) -> str:
     prompt = None
     max_distance = 1000
 
-    workflow = json.loads(workflow_json)
+    workflow = parse_json(workflow_json)
     nodes = workflow.get('nodes', [])
     for node in nodes:
 
@@ -306,6 +466,7 @@ def save_image(filepath        : str,
                image           : Image,
                text_chunks     : dict[str, str] = [],
                should_make_dirs: bool           = False,
+               compress_level  : int            = DEFAULT_PNG_COMPRESS_LEVEL,
                ) -> None:
     """Save an image to a specified filepath with optional metadata.
 
@@ -318,6 +479,8 @@ def save_image(filepath        : str,
         text_chunks      (dict): A dictionary containing key-value metadata
                                  that will be embedded into the PNG file.
         should_make_dirs (bool): If true, creates necessary directories before saving the image.
+        compress_level    (int): The zlib compression level (0-9) used for PNG images;
+                                 level 9 also enables PIL's size optimization.
     """
     extension = os.path.splitext(filepath)[1].lower()
 
@@ -330,22 +493,27 @@ def save_image(filepath        : str,
         image.save(filepath, 'JPEG', quality=80)
     else:
         # prepare text chunks to be saved together with the PNG image
+        # (stored uncompressed, as ComfyUI does, to avoid deflating the workflow again)
         pnginfo = PngInfo()
         for key in text_chunks:
-            pnginfo.add_text(key, text_chunks[key])
-        image.save(filepath, 'PNG', pnginfo=pnginfo, compress_level=9, optimize=True)
+            pnginfo.add_text(key, text_chunks[key], zip=False)
+        image.save(filepath, 'PNG', pnginfo=pnginfo, compress_level=compress_level, optimize=(compress_level>=9))
 
 
 #-------------------------------- BOX CLASS --------------------------------#
-class Box(tuple):
-    def __new__(cls, left, top=None, right=None, bottom=None):
-        if isinstance(left,tuple) and len(left)==4:
-            left, top, right, bottom = left[0], left[1], left[2], left[3]
-        return super(Box, cls).__new__(cls, (left, top, right, bottom))
+class Box(collections.namedtuple('Box', ('left', 'top', 'right', 'bottom'))):
+    # no per-instance __dict__, a Box is just the 4-tuple (left, top, right, bottom)
+    # with the coordinates accessible by name (namedtuple accessors are implemented in C)
+    __slots__ = ()
+
+    # indexes of the (x, y) coordinates of each anchor point
+    ANCHOR_INDEXES = {None: (0,1), 'lt': (0,1), 'rb': (2,3), 'rt': (2,1), 'lb': (0,3)}
 
     @classmethod
-    def bounding_for_text(cls, text: str, font: ImageFont):
-        return cls( font.getbbox(text) )
+    def from_tuple(cls, coords: tuple):
+        """Creates a Box from a tuple (left, top, right, bottom)."""
+        left, top, right, bottom = coords
+        return cls(left, top, right, bottom)
 
     @classmethod
     def multiline_textbbox(cls,
@@ -357,7 +525,7 @@ class Box(tuple):
                            spacing: float      = 4,
                            align  : str        = "left"
                            ):
-        return cls( draw.multiline_textbbox( xy, text, font=font, anchor=anchor, spacing=spacing, align=align ) )
+        return cls.from_tuple( draw.multiline_textbbox( xy, text, font=font, anchor=anchor, spacing=spacing, align=align ) )
 
     # @classmethod
     # def multiline_bbox(cls, text: str, font: ImageFont, draw: ImageDraw):
@@ -365,25 +533,9 @@ class Box(tuple):
 
     @classmethod
     def container_for_text(cls, text: str, font):
-        ascent, descent = font.getmetrics()
-        return cls( 0,0, font.getlength(text), ascent+descent )
-
-
-    @property
-    def left(self):
-        return self[0]
-
-    @property
-    def top(self):
-        return self[1]
+        ascent, descent = get_font_metrics(font)
+        return cls( 0,0, get_text_length(font, text), ascent+descent )
 
-    @property
-    def right(self):
-        return self[2]
-
-    @property
-    def bottom(self):
-        return self[3]
 
     @property
     def width(self):
@@ -399,9 +551,8 @@ class Box(tuple):
 
     def get_size(self):
         """Returns the width and height of the box."""
-        width = self.right - self.left
-        height = self.bottom - self.top
-        return width, height
+        left, top, right, bottom = self
+        return right - left, bottom - top
 
     def get_pos(self, anchor=None):
         """Returns the position of the box based on the specified anchor.
@@ -414,24 +565,19 @@ class Box(tuple):
         Returns:
             A Box containing the x and y coordinates of the specified anchor point.
         """
-        if anchor is None or anchor == 'lt':
-            return self.left, self.top
-        elif anchor == 'rb':
-            return self.right, self.bottom
-        elif anchor == 'rt':
-            return self.right, self.top
-        elif anchor == 'lb':
-            return self.left, self.bottom
-        else:
+        indexes = Box.ANCHOR_INDEXES.get(anchor)
+        if indexes is None:
             raise ValueError(f"Invalid anchor: {anchor}. Valid anchors are: 'lt', 'rb', 'rt', 'lb'.")
+        return self[indexes[0]], self[indexes[1]]
 
     def with_size(self, width, height):
         """Returns a new Box with the specified size."""
-        return Box(self.left, self.top, self.left + width, self.top + height)
+        left, top = self[0], self[1]
+        return Box(left, top, left + width, top + height)
 
     def with_pos(self, left, top):
         """Returns a new Box with the specified top-left position."""
-        width, height = self.get_size()
+        width, height = self[2] - self[0], self[3] - self[1]
         return Box(left, top, left + width, top + height)
 
     def moved_to(self, x, y=None, anchor=None ):
@@ -442,13 +588,15 @@ class Box(tuple):
 
     def moved_by(self, dx, dy):
         """Returns a new Box moved by (dx, dy)."""
-        return Box(self.left + dx, self.top + dy, self.right + dx, self.bottom + dy)
+        left, top, right, bottom = self
+        return Box(left + dx, top + dy, right + dx, bottom + dy)
 
     def centered_in(self, container_box):
         """Returns a new Box with the same size but centered within the provided container box."""
-        offset_x = (container_box.left + container_box.right  - self.left - self.right )/2
-        offset_y = (container_box.top  + container_box.bottom - self.top  - self.bottom)/2
-        return self.moved_by(offset_x, offset_y)
+        left, top, right, bottom = self
+        offset_x = (container_box[0] + container_box[2] - left - right )/2
+        offset_y = (container_box[1] + container_box[3] - top  - bottom)/2
+        return Box(left + offset_x, top + offset_y, right + offset_x, bottom + offset_y)
 
     def shrunken(self, dx: float, dy: float) -> 'Box':
         """Returns a new Box with reduced size by moving its edges inward.
@@ -458,7 +606,8 @@ class Box(tuple):
         Returns:
             A new Box with the specified size after shrinking.
         """
-        return Box(self.left + dx, self.top + dy, self.right - dx, self.bottom - dy)
+        left, top, right, bottom = self
+        return Box(left + dx, top + dy, right - dx, bottom - dy)
 
     def __repr__(self):
         return f"Box(left={self.left}, top={self.top}, right={self.right}, bottom={self.bottom})"
@@ -558,7 +707,7 @@ def write_text_in_box(image  : Image,
 
     textbbox = Box.multiline_textbbox( draw, (0,0), text, font=font, anchor=anchor, spacing=spacing, align=align )
     top_offset = textbbox.top
-    _, descent = font.getmetrics()
+    _, descent = get_font_metrics(font)
 
     textbbox = textbbox.centered_in( box )
     y = textbbox.top - top_offset + (descent/4)
@@ -601,7 +750,7 @@ def draw_two_word_label(image  : Image,
         PIL.Image: The image with the label added.
     """
     image_width, image_height = image.size
-    unit = Box.bounding_for_text('m', font1).width
+    unit = get_font_unit_width(font1)
     space_width = 0.2 * unit # space between the two words
     margin      = 1   * unit # minimum margin between the border and the text
 
@@ -612,35 +761,40 @@ def draw_two_word_label(image  : Image,
     word2_box = Box.container_for_text(word2, font2)
     total_width  = word1_box.width + word2_box.width + space_width
     total_height = max(word1_box.height, word2_box.height)
-    total_box    = Box(0,0, total_width, total_height)
 
     # adjust the size of the rectangle to contain the two words
     minimum_width = margin + total_width + margin
     if width < minimum_width:
         width = minimum_width
 
-    # draw the white rectangle
-    radius    = height/3 # radius of the rectangle's corner
-    whitebox1 = Box(0,0,width,height).moved_to( (image_width, image_height), anchor='rb' )
-    whitebox2 = whitebox1.moved_by(-radius,radius).with_size( radius, whitebox1.height-radius )
-    circlebox = whitebox1.moved_by(-radius,0).with_size( radius*2, radius*2 )
-    draw.rectangle(whitebox1, fill="white")
-    draw.rectangle(whitebox2, fill="white")
-    draw.ellipse(  circlebox, fill="white")
-
-    # center both words within the whitebox
-    total_box = total_box.centered_in( whitebox1.moved_by(-radius/2,0) )
-
-    # position word1 to the left of `total_box` and word2 to the right
-    word1_box = word1_box.moved_to( total_box.left, total_box.top, anchor='lt')
-    word2_box = word2_box.moved_to( total_box.right, total_box.top, anchor='rt')
-
-    # align word1 with word2 since they have different font sizes
-    word1_box = word1_box.moved_by(0, ascent_diference(font2, font1))
+    # (the coordinates below are computed directly with floats instead of
+    #  chaining Box methods, this function is called once for every image)
+
+    # draw the white rectangle anchored to the bottom right of the image,
+    # with a rounded top-left corner made of a rectangle plus a circle
+    radius      = height/3 # radius of the rectangle's corner
+    box_left    = image_width  - width
+    box_top     = image_height - height
+    box_right   = width  + box_left
+    box_bottom  = height + box_top
+    corner_left = box_left - radius
+    corner_top  = box_top  + radius
+    draw.rectangle((box_left, box_top, box_right, box_bottom), fill="white")
+    draw.rectangle((corner_left, corner_top, corner_left + radius, corner_top + (box_bottom - box_top - radius)), fill="white")
+    draw.ellipse(  (corner_left, box_top, corner_left + radius*2, box_top + radius*2), fill="white")
+
+    # center both words within the whitebox (shifted left to balance the corner)
+    total_left = ((box_left - radius/2) + (box_right - radius/2) - total_width )/2
+    total_top  = ( box_top              +  box_bottom             - total_height)/2
+
+    # position word1 to the left of the total area and word2 to the right,
+    # aligning word1 with word2 since they have different font sizes
+    word1_xy = (total_left, total_top + ascent_diference(font2, font1))
+    word2_xy = (total_width + total_left - word2_box.width, total_top)
 
     # write the words and return the image
-    draw.text(word1_box, word1, fill=color1, font=font1, anchor='la')
-    draw.text(word2_box, word2, fill=color2, font=font2, anchor='la')
+    draw.text(word1_xy, word1, fill=color1, font=font1, anchor='la')
+    draw.text(word2_xy, word2, fill=color2, font=font2, anchor='la')
     return image
 
 
@@ -661,6 +815,27 @@ def get_all_required_fonts(font_size: int,
             - font_w2: The font used to write the second word on the label.
             - prompt_fonts: A list of additional fonts in different sizes used to write the prompt.
     """
+    # fonts are cached by their final sizes (in pixels), this way images
+    # with slightly different scales still share the same fonts
+    return _load_required_fonts( int(font_size * scale * 1.0),
+                                 int(font_size * scale * 1.1),
+                                 int(font_size * scale * 1.3) )
+
+
+@functools.lru_cache(maxsize=16)
+def _load_required_fonts(label1_size    : int,
+                         label2_size    : int,
+                         max_prompt_size: int
+                         ) -> tuple:
+    """Cached implementation of `get_all_required_fonts`.
+
+    The returned fonts are shared between calls, they must not be modified.
+
+    Args:
+        label1_size     (int): The size of the font used for the first word on the label.
+        label2_size     (int): The size of the font used for the second word on the label.
+        max_prompt_size (int): The size of the largest font used to write the prompt.
+    """
     script_dir, script_name = os.path.split( os.path.abspath(__file__) )
     font_dir = os.path.join(script_dir, os.path.splitext(script_name)[0] + "-font")
 
@@ -687,9 +862,9 @@ def get_all_required_fonts(font_size: int,
     label_ttf_file   = robotoslab_ttf_file or default_ttf_file
     prompt_ttf_file  = opensans_ttf_file   or default_ttf_file
 
-    font_w1      = load_font(label_ttf_file, int(font_size * scale * 1.0) )
-    font_w2      = load_font(label_ttf_file, int(font_size * scale * 1.1) )
-    prompt_fonts = [load_font(prompt_ttf_file, size) for size in range(int(font_size * scale * 1.3), 10, -2)]
+    font_w1      = load_font(label_ttf_file, label1_size )
+    font_w2      = load_font(label_ttf_file, label2_size )
+    prompt_fonts = [load_font(prompt_ttf_file, size) for size in range(max_prompt_size, 10, -2)]
 
     select_font_variation(font_w1, b'ExtraBold', b'Black', b'Bold')
     select_font_variation(font_w2, b'ExtraBold', b'Black', b'Bold')
@@ -722,15 +897,10 @@ def add_label_to_image(image: Image,
     label_width  = int( DEFAULT_LABEL_WIDTH  * scale )
     label_height = int( DEFAULT_LABEL_HEIGHT * scale )
 
-    # extract the first two words from the provided text
-    if ' ' in text:
-        words = text.split(' ', 2)
-    elif '_' in text:
-        words = text.split('_', 2)
-    elif '-' in text:
-        words = text.split('-', 2)
-    else:
-        words = text
+    # extract the first two words from the provided text,
+    # using the first separator (in order of priority) present in it
+    separator = next((sep for sep in LABEL_WORD_SEPARATORS if sep in text), None)
+    words     = text.split(separator, 2) if separator else ([text] if text else [])
     word1  = words[0] if len(words)>=1 else '???'
     word2  = words[1] if len(words)>=2 else '???'
 
@@ -854,6 +1024,53 @@ def process_image(image         : Image,
     return output_image
 
 
+def label_image_file(image_path      : str,
+                     new_image_path  : str,
+                     font_size       : int,
+                     write_prompt    : bool  = False,
+                     write_label     : bool  = True,
+                     label_text      : str   = None,
+                     output_scale    : float = None,
+                     should_make_dirs: bool  = False,
+                     compress_level  : int   = DEFAULT_PNG_COMPRESS_LEVEL,
+                     ) -> str:
+    """Labels a single image file and saves the result to a new path.
+
+    Args:
+        image_path       (str) : The path of the image to process.
+        new_image_path   (str) : The path where the labeled image will be saved.
+        font_size        (int) : Approximate font size used to label the image.
+        write_prompt     (bool): If True, writes the original prompt on the image.
+        write_label      (bool): If True, draws a label on the image.
+        label_text       (str) : If provided, this text will be used as the label.
+        output_scale    (float): Scaling factor for resizing the processed image.
+        should_make_dirs (bool): If true, creates necessary directories before saving the image.
+        compress_level   (int) : The zlib compression level (0-9) used for PNG images.
+    Returns:
+        The path of the labeled image, or None if the image was not labeled.
+    """
+    # PNG images without a workflow are discarded before decoding them
+    if not has_workflow_chunk(image_path):
+        warning(f"The image {image_path} does not seem to contain any workflow.")
+        return None
+
+    # open the image and process it
+    with Image.open(image_path) as image:
+        text_chunks = image.text if hasattr(image,'text') else []
+        workflow    = text_chunks.get('workflow')
+        if not workflow:
+            warning(f"The image {image_path} does not seem to contain any workflow.")
+            return None
+        output_image = process_image(image, workflow, font_size, write_prompt, write_label, label_text, output_scale)
+
+    save_image(new_image_path,
+               output_image  ,
+               text_chunks      = text_chunks,
+               should_make_dirs = should_make_dirs,
+               compress_level   = compress_level)
+    return new_image_path
+
+
 def process_all_images(image_paths      : list,
                        font_size        : int,
                        write_prompt     : bool  = False,
@@ -864,9 +1081,12 @@ def process_all_images(image_paths      : list,
                        output_prefix    : str   = None,
                        output_format    : str   = None,
                        keep_original_dir: bool  = False,
+                       compress_level   : int   = DEFAULT_PNG_COMPRESS_LEVEL,
                        ) -> None:
     """Process multiple images by adding labels and saving them with a new prefix.
 
+    The images are processed in parallel, one worker process per CPU core.
+
     Args:
         image_paths    (list): A list with the paths of the images to process.
         font_size      (int) : Approximate font size used to label the images.
@@ -884,6 +1104,7 @@ def process_all_images(image_paths      : list,
                                If not specified, the same format as the original image will be used.
         keep_original_dir (bool): If True, the images will be saved in the same dir as the original
                                   image. Otherwise, they will be stored in the current working dir.
+        compress_level (int) : The zlib compression level (0-9) used for PNG images.
     """
     if not isinstance(image_paths,list):
         image_paths = [image_paths]
@@ -903,48 +1124,66 @@ def process_all_images(image_paths      : list,
     # create new directories only if a specific output_dir is provided
     should_make_dirs = True if output_dir else False
 
+    # collect the images to process indexed by their new absolute paths,
+    # so two workers never write the same output file at the same time;
+    # when several images map to the same new path (an image listed more
+    # than once or images with the same name in different directories)
+    # only the last one is kept, as a sequential run would have left it
+    paths_by_target = {}
     for image_path in image_paths:
-        #try:
 
-            original_dir, filename  = os.path.split(image_path)
-            name, extension         = os.path.splitext(filename)
+        # skip images that were previously labeled
+        if os.path.basename(image_path).startswith(output_prefix):
+            continue
 
-            # skip images that were previously labeled
-            if filename.startswith(output_prefix):
+        original_dir, filename  = os.path.split(image_path)
+        name, extension         = os.path.splitext(filename)
+
+        # change extension based on output_format
+        if output_format == 'jpeg':
+            extension = '.jpg'
+        elif output_format == 'png':
+            extension = '.png'
+
+        # generate the new path
+        new_image_path  = f"{output_prefix}{name}{extension}"
+        if keep_original_dir:
+            new_image_path = os.path.join(original_dir, new_image_path)
+        if output_dir:
+            new_image_path = os.path.join(output_dir, new_image_path)
+            if new_image_path != os.path.normpath(new_image_path):
                 continue
 
-            # change extension based on output_format
-            if output_format == 'jpeg':
-                extension = '.jpg'
-            elif output_format == 'png':
-                extension = '.png'
-
-            # generate the new path
-            new_image_path  = f"{output_prefix}{name}{extension}"
-            if keep_original_dir:
-                new_image_path = os.path.join(original_dir, new_image_path)
-            if output_dir:
-                new_image_path = os.path.join(output_dir, new_image_path)
-                if new_image_path != os.path.normpath(new_image_path):
-                    continue
-
-            # open the image and process it
-            with Image.open(image_path) as image:
-                text_chunks = image.text if hasattr(image,'text') else []
-                workflow    = text_chunks.get('workflow')
-                if not workflow:
-                    warning(f"The image {image_path} does not seem to contain any workflow.")
-                    continue
-                output_image = process_image(image, workflow, font_size, write_prompt, write_label, label_text, output_scale)
-
-            save_image(new_image_path,
-                       output_image  ,
-                       text_chunks      = text_chunks,
-                       should_make_dirs = should_make_dirs)
-            print(f" Labeled: {new_image_path}")
-
-        #except Exception as e:
-        #    print(f"Error processing {image_path}: {str(e)}")
+        absolute_target = os.path.abspath(new_image_path)
+        paths_by_target.pop(absolute_target, None)
+        paths_by_target[absolute_target] = (image_path, new_image_path)
+
+    if not paths_by_target:
+        return
+    source_paths, target_paths = zip(*paths_by_target.values())
+
+    # each image is decoded, labeled and re-encoded independently,
+    # so they are distributed among several processes
+    label_image = functools.partial(label_image_file,
+                                    font_size        = font_size,
+                                    write_prompt     = write_prompt,
+                                    write_label      = write_label,
+                                    label_text       = label_text,
+                                    output_scale     = output_scale,
+                                    should_make_dirs = should_make_dirs,
+                                    compress_level   = compress_level)
+    # the labeled images are reported in batches to reduce the writes to stdout
+    report_lines = []
+    with ProcessPoolExecutor() as executor:
+        for labeled_path in executor.map(label_image, source_paths, target_paths):
+            if labeled_path:
+                report_lines.append(f" Labeled: {labeled_path}\n")
+            if len(report_lines) >= REPORT_BATCH_SIZE:
+                sys.stdout.write(''.join(report_lines))
+                sys.stdout.flush()
+                report_lines.clear()
+    sys.stdout.write(''.join(report_lines))
+    sys.stdout.flush()
 
 
 
@@ -968,6 +1207,8 @@ def main():
     parser.add_argument(      '--prefix'      ,                      help="Prefix for processed image files")
     parser.add_argument(      '--font'        ,                      help="Path to font file")
     parser.add_argument(      '--font-size'   , type=int,            help="Font size for the label")
+    parser.add_argument(      '--compress-level', type=int, choices=range(10), default=DEFAULT_PNG_COMPRESS_LEVEL, metavar='LEVEL',
+                                                                     help=f"PNG compression level, 0-9 (default: {DEFAULT_PNG_COMPRESS_LEVEL})")
 
     args  = parser.parse_args()
 
@@ -992,7 +1233,8 @@ def main():
                        output_dir    = args.output_dir,
                        output_prefix = args.prefix,
                        output_format = 'jpeg' if args.jpeg else None,
-                       keep_original_dir = args.keep_dir
+                       keep_original_dir = args.keep_dir,
+                       compress_level    = args.compress_level
                        )
 
 
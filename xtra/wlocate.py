@@ -37,6 +37,12 @@ import json
 import hashlib
 import argparse
 from PIL import Image
+try:
+    # orjson is used (when available) to speed up parsing JSON workflows
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # ANSI escape codes for colored terminal output
 RED    = '\033[91m'
@@ -126,6 +132,18 @@ def get_unique_path(path):
     return unique_path
 
 
+def parse_json(json_text):
+    """Parses a JSON document, using orjson when it's available.
+    Args:
+        json_text (str|bytes): The JSON document to parse.
+    Returns:
+        The parsed JSON data.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(json_text)
+    return json.loads(json_text)
+
+
 def filter_words(words: list) -> list:
     """Removes words from a list that do not start with an alphanumeric character.
     Args:
@@ -151,7 +169,7 @@ def get_workflow_name(workflow_json: str) -> str:
         name          = 'abominable workflow'
         name_distance = 100000
 
-        workflow = json.loads(workflow_json)
+        workflow = parse_json(workflow_json)
         groups = workflow.get('groups', [])
         for group in groups:
             title    = group.get('title')
@@ -180,7 +198,7 @@ def get_prompt_text(workflow_json: str) -> str:
     prompt = None
     max_distance = 1000
 
-    workflow = json.loads(workflow_json)
+    workflow = parse_json(workflow_json)
     nodes = workflow.get('nodes', [])
     for node in nodes:
 
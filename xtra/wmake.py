@@ -33,8 +33,17 @@ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _
 """
 import os
 import sys
+import copy
 import json
-import argparse
+import mmap
+import functools
+from concurrent.futures import ProcessPoolExecutor
+try:
+    # orjson is used (when available) to speed up reading/writing JSON files
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # ANSI escape codes for colored terminal output
 RED    = '\033[91m'
@@ -43,6 +52,10 @@ YELLOW = '\033[93m'
 CYAN   = '\033[96m'
 DEFAULT_COLOR = '\033[0m'
 
+# Disable colors when stderr is not a terminal or NO_COLOR is set
+if not sys.stderr.isatty() or os.environ.get('NO_COLOR'):
+    RED = GREEN = YELLOW = CYAN = DEFAULT_COLOR = ''
+
 # Get the directory of the current Python script
 SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
 
@@ -55,42 +68,53 @@ DEFAULT_WORKFLOW_EXT = '.json'
 # Indentation level for JSON output
 JSON_INDENT=2
 
-# List of available samplers in ComfyUI
-SAMPLER_NAMES = [
+# Minimum number of wildcards in a target to index them with tries
+# (for fewer wildcards a linear scan is faster)
+WILDCARD_TRIE_THRESHOLD = 5
+
+# Set of available samplers in ComfyUI
+SAMPLER_NAMES = frozenset([
     "euler", "euler_cfg_pp", "euler_ancestral", "euler_ancestral_cfg_pp", "heun", "heunpp2","dpm_2", "dpm_2_ancestral",
     "lms", "dpm_fast", "dpm_adaptive", "dpmpp_2s_ancestral", "dpmpp_2s_ancestral_cfg_pp", "dpmpp_sde", "dpmpp_sde_gpu",
     "dpmpp_2m", "dpmpp_2m_sde", "dpmpp_2m_sde_gpu", "dpmpp_3m_sde", "dpmpp_3m_sde_gpu", "ddpm", "lcm",
     "ipndm", "ipndm_v", "deis", "ddim", "uni_pc", "uni_pc_bh2"
-    ]
+    ])
 
-# List of available schedulers in ComfyUI
-SCHEDULER_NAMES = [
+# Set of available schedulers in ComfyUI
+SCHEDULER_NAMES = frozenset([
     "normal", "karras", "exponential", "sgm_uniform", "simple", "ddim_uniform", "beta"
-    ]
+    ])
 
 
 #----------------------------- ERROR MESSAGES ------------------------------#
 
+# Colored prefixes used by the message functions,
+# precomputed to avoid composing them on each call
+MESSAGE_PREFIX      = f"  {GREEN}>{DEFAULT_COLOR} "
+WARNING_PREFIX      = f"{CYAN}[{YELLOW}WARNING{CYAN}]{YELLOW} "
+WARNING_INFO_PREFIX = f"          {YELLOW}"
+ERROR_PREFIX        = f"{CYAN}[{RED}ERROR{CYAN}]{RED} "
+ERROR_INFO_PREFIX   = f"          {RED}"
+FATAL_INFO_PREFIX   = f" {CYAN}\u24d8  "
+
 def message(text: str) -> None:
     """Displays and logs a regular message to the standard error stream.
     """
-    print(f"  {GREEN}>{DEFAULT_COLOR} {text}", file=sys.stderr)
+    sys.stderr.write(MESSAGE_PREFIX + text + "\n")
 
 def warning(message: str, *info_messages: str) -> None:
     """Displays and logs a warning message to the standard error stream.
     """
-    print(f"{CYAN}[{YELLOW}WARNING{CYAN}]{YELLOW} {message}{DEFAULT_COLOR}", file=sys.stderr)
-    for info_message in info_messages:
-        print(f"          {YELLOW}{info_message}{DEFAULT_COLOR}", file=sys.stderr)
-    print()
+    lines = [WARNING_PREFIX + message + DEFAULT_COLOR]
+    lines.extend(WARNING_INFO_PREFIX + info_message + DEFAULT_COLOR for info_message in info_messages)
+    sys.stderr.write("\n".join(lines) + "\n\n")
 
 def error(message: str, *info_messages: str) -> None:
     """Displays and logs an error message to the standard error stream.
     """
-    print(f"{CYAN}[{RED}ERROR{CYAN}]{RED} {message}{DEFAULT_COLOR}", file=sys.stderr)
-    for info_message in info_messages:
-        print(f"          {RED}{info_message}{DEFAULT_COLOR}", file=sys.stderr)
-    print()
+    lines = [ERROR_PREFIX + message + DEFAULT_COLOR]
+    lines.extend(ERROR_INFO_PREFIX + info_message + DEFAULT_COLOR for info_message in info_messages)
+    sys.stderr.write("\n".join(lines) + "\n\n")
 
 def fatal_error(message: str, *info_messages: str) -> None:
     """Displays and logs an fatal error to the standard error stream and exits.
@@ -98,12 +122,72 @@ def fatal_error(message: str, *info_messages: str) -> None:
         message       : The fatal error message to display.
         *info_messages: Optional informational messages to display after the error.
     """
-    error(message)
-    for info_message in info_messages:
-        print(f" {CYAN}\u24d8  {info_message}{DEFAULT_COLOR}", file=sys.stderr)
+    lines = [ERROR_PREFIX + message + DEFAULT_COLOR, ""]
+    lines.extend(FATAL_INFO_PREFIX + info_message + DEFAULT_COLOR for info_message in info_messages)
+    sys.stderr.write("\n".join(lines) + "\n")
     exit(1)
 
 
+#------------------------------- TEXT FILES --------------------------------#
+
+def read_text_file(filepath: str) -> str:
+    """Reads the whole content of a UTF-8 text file.
+
+    The file is memory-mapped and decoded directly from the mapping,
+    line endings are normalized (LF) as when reading in text mode.
+
+    Args:
+        filepath (str): The path to the file to read.
+    Returns:
+        The content of the file as a string.
+    """
+    with open(filepath, 'rb') as f:
+        # empty files cannot be memory-mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, 'utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+#------------------------------- JSON FILES --------------------------------#
+
+def read_json(filename: str):
+    """Reads and parses a JSON file.
+    Args:
+        filename (str): The path to the JSON file.
+    Returns:
+        The parsed JSON data.
+    """
+    # orjson can parse the memory-mapped file directly, without copying it to memory
+    if ORJSON_AVAILABLE and os.path.getsize(filename) > 0:
+        with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as buffer:
+                return orjson.loads(buffer)
+    with open(filename, "r") as f:
+        return json.load(f)
+
+def write_json(filename: str, data, indent: int = 0) -> None:
+    """Writes data to a JSON file (UTF-8, non-ASCII characters are not escaped).
+    Args:
+        filename (str): The path to the JSON file.
+        data          : The data to be written.
+        indent   (int): The indentation level, 0 for compact output.
+    """
+    # the whole JSON is serialized in memory and then written with a single call
+    # (orjson only supports an indentation of 2 spaces)
+    if ORJSON_AVAILABLE and indent in (0, 2):
+        json_bytes = orjson.dumps(data, option=(orjson.OPT_INDENT_2 if indent==2 else 0))
+    else:
+        json_bytes = json.dumps(data,
+                                indent=(indent if indent>0 else None),
+                                ensure_ascii=False).encode("utf-8")
+    with open(filename, "wb") as f:
+        f.write(json_bytes)
+
+
 #-------------------------- CONFIGURATIONS CLASS ---------------------------#
 class Configurations:
 
@@ -119,6 +203,21 @@ class Configurations:
         self.wildcards_by_target  = wildcards_by_target
         self.global_vars          = global_vars
 
+        # each target gets a single resolver tuple (parameters, wildcards, tries)
+        # so `get` needs only one lookup to reach everything it uses;
+        # targets with many wildcards get their prefixes and (reversed) suffixes
+        # indexed in tries, so a lookup does not have to test every wildcard
+        self.resolvers_by_target = {}
+        for target in parameters_by_target.keys() | wildcards_by_target.keys():
+            parameters = parameters_by_target.get(target) or {}
+            wildcards  = wildcards_by_target.get(target)  or []
+            tries      = None
+            if len(wildcards) >= WILDCARD_TRIE_THRESHOLD:
+                prefix_trie = Configurations._build_trie( wildcard[0]       for wildcard in wildcards )
+                suffix_trie = Configurations._build_trie( wildcard[1][::-1] for wildcard in wildcards )
+                tries       = (prefix_trie, suffix_trie)
+            self.resolvers_by_target[target] = (parameters, wildcards, tries)
+
     @classmethod
     def from_file(cls, configs_path: str) -> 'Configurations':
         """Loads a Configurations object from a file.
@@ -136,71 +235,83 @@ class Configurations:
         all_filenames = set()
         filename      = ''
         target        = ''
-        configs_dir   = os.path.dirname(configs_path)
-
-        with open(configs_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-
-                if not line or line.startswith("#"):
-                    # it's a comment:
-                    #  skip the line
-                    continue
-
-                elif line.startswith("@"):
-                    # it's a global variable declaration:
-                    #  store it in the 'global_vars' dictionary
-                    key, strvalue = Configurations._read_keyvalue(line[1:])
-                    global_vars[key] = strvalue
-
-                elif line.startswith("./"):
-                    # it's a filename declaration:
-                    #  1) store the collected 'parameters' for the current target
-                    #  2) start a new list of 'parameters' for the new target.
-                    if filename and target:
-                        all_filenames.add(filename)
-                        parameters_by_target[target] = parameters
-                        wildcards_by_target[target]  = wildcards
-                    parameters = {}
-                    wildcards  = []
-                    # filenames always have an extension,
-                    # targets are filenames without the extension
-                    filename     = Configurations._read_filename(line)
-                    target, _ext = os.path.splitext(filename)
-                    if not _ext:
-                        filename += DEFAULT_WORKFLOW_EXT
+        delimiter     = './'
+        configs_dir   = os.path.abspath(os.path.dirname(configs_path))
+
+        # global variables starting with "NODE." are aliases of node names,
+        # they are kept apart so parameter lines can resolve them with one lookup
+        node_aliases  = {}
+
+        lines = read_text_file(configs_path).split('\n')
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            # the kind of line is determined by its first character
+            first_char = line[0]
+            if first_char == "#":
+                # it's a comment:
+                #  skip the line
+                continue
+
+            elif first_char == "@":
+                # it's a global variable declaration:
+                #  store it in the 'global_vars' dictionary
+                key, strvalue = Configurations._read_keyvalue(line[1:])
+                global_vars[key] = strvalue
+                if key.startswith('NODE.'):
+                    node_aliases[key] = strvalue
+
+            elif first_char == "." and line[1:2] == "/":
+                # it's a filename declaration:
+                #  1) store the collected 'parameters' for the current target
+                #  2) start a new list of 'parameters' for the new target.
+                if filename and target:
+                    all_filenames.add(filename)
+                    parameters_by_target[target] = parameters
+                    wildcards_by_target[target]  = wildcards
+                parameters = {}
+                wildcards  = []
+                # filenames always have an extension,
+                # targets are filenames without the extension
+                filename     = Configurations._read_filename(line)
+                target, _ext = os.path.splitext(filename)
+                if not _ext:
+                    filename += DEFAULT_WORKFLOW_EXT
+                # delimiter used to locate the text of this target in external files
+                delimiter = f"./{filename}"
 
+            else:
+                # it's a parameter declaration:
+                #  collect the parameter in the 'parameters' dictionary
+                key, strvalue = Configurations._read_keyvalue(line,
+                                          extern_dir       = configs_dir,
+                                          extern_delimiter = delimiter)
+                # if the parameter name starts with "NODE.",
+                # it might be defined as a global variable
+                key = node_aliases.get(key, key)
+
+                # convert the string value to its correct data type
+                # (e.g., int, float, etc.)
+                value = Configurations._fix_value(strvalue)
+                assert isinstance(value, (bool,int,float,str))
+
+                if '*' in key:
+                    # if the parameter name contains '*',
+                    # add it to the 'wildcards' list for further processing
+                    parts = key.split('*', 1)
+                    wildcards.append( (parts[0], parts[1], value) )
                 else:
-                    # it's a parameter declaration:
-                    #  collect the parameter in the 'parameters' dictionary
-                    key, strvalue = Configurations._read_keyvalue(line,
-                                              extern_dir       = configs_dir,
-                                              extern_delimiter = f"./{filename}")
-                    # if the parameter name starts with "NODE.",
-                    # it might be defined as a global variable
-                    if key.startswith('NODE.'):
-                        if key in global_vars:
-                            key = global_vars[key]
-
-                    # convert the string value to its correct data type
-                    # (e.g., int, float, etc.)
-                    value = Configurations._fix_value(strvalue)
-                    assert isinstance(value, (bool,int,float,str))
-
-                    if '*' in key:
-                        # if the parameter name contains '*',
-                        # add it to the 'wildcards' list for further processing
-                        parts = key.split('*', 1)
-                        wildcards.append( (parts[0], parts[1], value) )
+                    # if the parameter is new, add it to the 'parameters' dict
+                    # if the parameter already exists, create a list to store multiple values
+                    if key not in parameters:
+                        parameters[key] = value
+                    elif not isinstance(parameters[key], list):
+                        parameters[key] = [parameters[key], value]
                     else:
-                        # if the parameter is new, add it to the 'parameters' dict
-                        # if the parameter already exists, create a list to store multiple values
-                        if key not in parameters:
-                            parameters[key] = value
-                        elif not isinstance(parameters[key], list):
-                            parameters[key] = [parameters[key], value]
-                        else:
-                            parameters[key].append(value)
+                        parameters[key].append(value)
 
         # if 'parameters' and 'wildcards' are pending,
         # add them to the dictionaries
@@ -232,13 +343,30 @@ class Configurations:
             The value of the parameter if found.
             None, if the parameter is not found.
         """
-        target = os.path.splitext(target)[0]
-        parameters = self.parameters_by_target.get(target)
-        value      = parameters.get(parameter) if parameters is not None else None
+        return self.get_by_target(os.path.splitext(target)[0], parameter)
+
+    def get_by_target(self, target: str, parameter: str):
+        """Same as `get` but with a target that already has no extension.
+
+        Useful when many parameters of the same workflow are retrieved,
+        the extension is removed only once by the caller.
+        """
+        resolver = self.resolvers_by_target.get(target)
+        if resolver is None:
+            return None
+
+        parameters, wildcards, tries = resolver
+        value = parameters.get(parameter)
         if value is not None:
             return value
 
-        wildcards = self.wildcards_by_target.get(target)
+        if tries is not None:
+            # the first wildcard (in order of declaration) whose prefix and suffix match
+            prefix_trie, suffix_trie = tries
+            matches = Configurations._match_trie(prefix_trie, parameter) \
+                    & Configurations._match_trie(suffix_trie, parameter[::-1])
+            return wildcards[min(matches)][2] if matches else None
+
         for wildcard in wildcards:
             if parameter.startswith(wildcard[0]) and parameter.endswith(wildcard[1]):
                 return wildcard[2]
@@ -246,6 +374,37 @@ class Configurations:
         return None
 
 
+    @staticmethod
+    def _build_trie(words) -> dict:
+        """Builds a trie with the given words.
+        Args:
+            words: An iterable of strings.
+        Returns:
+            A dict-of-dicts trie where the key `None` stores the
+            indexes of the words ending at that node.
+        """
+        trie = {}
+        for word_index, word in enumerate(words):
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node.setdefault(None, []).append(word_index)
+        return trie
+
+
+    @staticmethod
+    def _match_trie(trie: dict, text: str) -> set:
+        """Returns the indexes of all words in the trie that are a prefix of the text."""
+        matches = set( trie.get(None, ()) )
+        node    = trie
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            matches.update( node.get(None, ()) )
+        return matches
+
+
     @staticmethod
     def _read_filename(line: str) -> str:
         """Reads a filename from a line of text.
@@ -254,9 +413,7 @@ class Configurations:
         Returns:
             The filename, stripped of leading periods and slashes.
         """
-        filename = line.strip()
-        while filename.startswith(".") or filename.startswith("/"):
-            filename = filename[1:]
+        filename = line.strip().lstrip("./")
         if " " in filename:
             fatal_error(f"Filename cannot contain spaces: {filename}", "Please check the input.")
         return filename
@@ -269,7 +426,7 @@ class Configurations:
         This function handles various cases for the value:
         - If the value starts with "@", it assumes it's a ref to an external file.
         The function then reads the file and extracts the value using the delimiter.
-        - If the value starts with a single quote ('), it assumes it's a string literal.
+        - If the value is enclosed in quotes (' or "), it assumes it's a string literal.
 
         Args:
             line             (str): The line of text to parse.
@@ -278,22 +435,33 @@ class Configurations:
         Returns:
             A tuple containing the key and value.
         """
-        key, value = line.split(':', 1)
+        # plain string splitting is intentional here, a regex would be
+        # several times slower and keys/values never contain escapes
+        key, separator, value = line.partition(':')
+        if not separator:
+            fatal_error(f"Invalid configuration line (missing ':'): {line}", "Please check the input.")
         key, value = key.strip(), value.strip()
 
+        # keys are used for many dictionary lookups,
+        # interning them lets equal keys be compared by identity
+        key = sys.intern(key)
+
+        # plain values (the most common case) need no further processing
+        first_char = value[:1]
+        if not first_char or first_char not in "@'\"":
+            return key, value
+
         # handle external file reference
-        if value.startswith("@")      \
+        if first_char == "@"          \
            and extern_dir is not None \
            and extern_delimiter is not None:
 
             path_ = os.path.join(extern_dir, value[1:])
             value = Configurations._extract_text_from_file(path_, extern_delimiter).strip()
 
-        # handle string literal
-        elif value.startswith("'"):
-            value = value.strip("'")
-        elif value.startswith('"'):
-            value = value.strip('"')
+        # handle string literal (removing only the enclosing quotes)
+        elif len(value)>=2 and value[0] in "'\"" and value[-1] == value[0]:
+            value = value[1:-1]
 
         return key, value
 
@@ -315,20 +483,67 @@ class Configurations:
             The text extracted between the delimiters,
             or an empty string if no valid delimiters are found.
         """
-        extracted_text = ""
-        capturing = False
-        with open(filepath, 'r') as file:
-            for line in file:
-                if line.strip() == start_delimiter or line.strip() == '>*<':
-                    capturing = True
-                elif capturing and line.startswith('>--'):
-                    break
-                elif capturing:
-                    extracted_text += line
-        return extracted_text
+        return Configurations._extract_text(filepath, start_delimiter, os.path.getmtime(filepath))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _extract_text(filepath: str, start_delimiter: str, mtime: float) -> str:
+        """Cached implementation of `_extract_text_from_file`.
+        Args:
+            filepath        (str): The path to the file to read.
+            start_delimiter (str): The delimiter that marks where to start extracting text.
+            mtime         (float): The modification time of the file (only used as cache key).
+        """
+        lines, first_index_by_line = Configurations._read_lines(filepath, mtime)
+
+        # find where the capture starts without scanning the file,
+        # if no delimiter is present there is nothing to extract
+        start_indexes = [first_index_by_line[delimiter] for delimiter in (start_delimiter, '>*<')
+                         if delimiter in first_index_by_line]
+        if not start_indexes:
+            return ""
+
+        extracted_lines = []
+        for index in range(min(start_indexes)+1, len(lines)):
+            line = lines[index]
+            if line.strip() == start_delimiter or line.strip() == '>*<':
+                continue
+            elif line.startswith('>--'):
+                break
+            else:
+                extracted_lines.append(line)
+        return ''.join(extracted_lines)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _read_lines(filepath: str, mtime: float) -> tuple:
+        """Reads all lines of a text file, caching the result between calls.
+        Args:
+            filepath (str): The path to the file to read.
+            mtime  (float): The modification time of the file (only used as cache key).
+        Returns:
+            A tuple containing:
+              - a tuple with all the lines of the file, including their line endings.
+              - a dict mapping each stripped line to the index of its first occurrence.
+        """
+        # split only on '\n' (as reading the file line by line does),
+        # adding back the line ending to every line but the last one
+        parts = read_text_file(filepath).split('\n')
+        lines = tuple( part + '\n' for part in parts[:-1] )
+        if parts[-1]:
+            lines += (parts[-1],)
+        first_index_by_line = {}
+        for index, line in enumerate(lines):
+            first_index_by_line.setdefault(line.strip(), index)
+        return lines, first_index_by_line
 
     @staticmethod
     def _fix_value(strvalue:str):
+        # numbers can only start with a digit, a sign, a dot, a space or the first
+        # letter of 'inf'/'nan'; any other value is returned without raising exceptions
+        first_char = strvalue[:1]
+        if not first_char or not (first_char.isdigit() or first_char.isspace() or first_char in "+-.iInN"):
+            return strvalue
         try:
             return int(strvalue)
         except ValueError:
@@ -341,15 +556,12 @@ class Configurations:
 #---------------------------------- NODES ----------------------------------#
 
 def get_name(node: dict) -> str:
-    assert node is not None
     return node.get('title', node.get('type', ''))
 
 def get_type(node: dict) -> str:
-    assert node is not None
     return node.get('type', '')
 
 def get_values(node: dict) -> list:
-    assert node is not None
     return node.get('widgets_values', [])
 
 def get_value_kind(value) -> str:
@@ -376,44 +588,60 @@ def set_node_value(node: dict, value, index: int=0):
         original_type = type(widgets_values[index])
         widgets_values[index] = original_type(value)
 
-def modify_node_value(node: dict,
-                      new_value,
-                      old_value  = None,
-                      value_kind = None,
-                      node_name  = None
-                      ):
-    assert node is not None
-
-    if node_name is None:
-        node_name = f"'{get_name(node)}'"
-
+def find_node_value(node: dict, old_value=None, value_kind=None) -> tuple:
+    """Finds the widget value of a node that matches an old value and/or a kind of value.
+    Args:
+        node     (dict): The node where the value is searched.
+        old_value      : If provided, the value (of the same type) to find.
+        value_kind (str): If provided, the kind of value to find (see `get_value_kind`).
+    Returns:
+        A tuple (found_index, found_count) with the index of the last match
+        and the number of matches found; the search stops as soon as a second
+        match is found, so any ambiguity is reported as a count of 2.
+    """
+    old_value_type = type(old_value)
     found_count    = 0
     found_index    = None
     widgets_values = node.get('widgets_values', [])
-    for index in range(len(widgets_values)):
+    for index, widget_value in enumerate(widgets_values):
 
         if old_value is not None:
-            if isinstance(widgets_values[index], type(old_value)) \
-               and widgets_values[index] == old_value:
+            if isinstance(widget_value, old_value_type) and widget_value == old_value:
                 found_index  = index
                 found_count += 1
 
         if value_kind is not None:
-            if get_value_kind(widgets_values[index]) == value_kind:
+            if get_value_kind(widget_value) == value_kind:
                 found_index  = index
                 found_count += 1
 
-    if found_count == 0:
-        warning(f"The configuration {DEFAULT_COLOR}{node_name} = {new_value}{YELLOW} could not be applied.",
-                 "(no entry matching the expected type was found).")
-        return
+        # more than one match is already ambiguous, no need to keep searching
+        if found_count > 1:
+            break
+
+    return found_index, found_count
 
-    if found_count > 1:
-        warning(f"The configuration {DEFAULT_COLOR}{node_name} = {new_value}{YELLOW} could not be applied.",
-                 "(multiple matches were found creating ambiguity).")
+def modify_node_value(node: dict,
+                      new_value,
+                      old_value  = None,
+                      value_kind = None,
+                      node_name  = None
+                      ):
+    found_index, found_count = find_node_value(node, old_value, value_kind)
+    if found_count != 1:
+        # the node name is only needed to report the problem
+        if node_name is None:
+            node_name = f"'{get_name(node)}'"
+        if found_count == 0:
+            warning(f"The configuration {DEFAULT_COLOR}{node_name} = {new_value}{YELLOW} could not be applied.",
+                     "(no entry matching the expected type was found).")
+        else:
+            warning(f"The configuration {DEFAULT_COLOR}{node_name} = {new_value}{YELLOW} could not be applied.",
+                     "(multiple matches were found creating ambiguity).")
         return
 
-    original_type = type(widgets_values[found_index])
+    widgets_values = node['widgets_values']
+    original_type  = type(widgets_values[found_index])
     widgets_values[found_index] = original_type(new_value)
 
 
@@ -421,6 +649,9 @@ def modify_node_value(node: dict,
 class Workflow:
     """Represents a workflow with a name and a list of steps.
     """
+    __slots__ = ('data', 'nodes', 'links', 'groups',
+                 'nodes_by_id', 'links_by_id', '_connected_ids_cache', '_primitive_plans_cache',
+                 '_template')
 
     def __init__(self, data):
         """Initializes a new Workflow object.
@@ -429,15 +660,8 @@ class Workflow:
         links  = data.get('links' , [])
         groups = data.get('groups', [])
 
-        nodes_by_id = {}
-        for node in nodes:
-            if 'id' in node:
-                nodes_by_id[node['id']] = node
-
-        links_by_id = {}
-        for link in links:
-            if len(link)>=5:
-                links_by_id[link[0]] = link
+        nodes_by_id = {node['id']: node for node in nodes if 'id' in node}
+        links_by_id = {link[0]: link for link in links if len(link)>=5}
 
         self.data        = data
         self.nodes       = nodes
@@ -446,6 +670,54 @@ class Workflow:
         self.nodes_by_id = nodes_by_id
         self.links_by_id = links_by_id
 
+        # cache of already resolved connections, it maps (node_id, output_index)
+        # to the ids of the connected nodes, so it remains valid for all copies
+        self._connected_ids_cache = {}
+
+        # cache of the values modified by each primitive (see `get_primitive_plan`),
+        # it is only filled in templates, from their own unmodified nodes
+        self._primitive_plans_cache = {}
+
+        # the workflow this one was copied from, None if it is not a copy
+        self._template = None
+
+
+    def _set_primitive_node(self, node: dict, value):
+        """Sets the value of a `PrimitiveNode` and all its directly connected nodes."""
+        new_value      = value
+        old_value      = node.get('widgets_values', [])[0]
+        primitive_name = get_name(node)
+
+        modify_node_value(node, new_value, old_value)
+        for connected_node, template_values, index in self.get_primitive_plan(node, old_value):
+            connected_values = connected_node.get('widgets_values', [])
+            # the planned index is only valid while the connected node keeps
+            # the same values as in the template, otherwise search for the
+            # value again (reporting any problem)
+            if index is not None and connected_values == template_values:
+                connected_values[index] = type(connected_values[index])(new_value)
+            else:
+                modify_node_value(connected_node, new_value, old_value,
+                                  node_name=f"'{primitive_name}'->'{get_name(connected_node)}'")
+
+    def _set_note_node(self, node: dict, value):
+        """Sets the value of a `Note` node.
+        The first line of the text will be the title of the note,
+        the rest of the text will be the content.
+        """
+        lines = str(value).splitlines()
+        if len(lines)>1:
+            set_node_title( node, lines[0]             )
+            set_node_value( node, "\n".join(lines[1:]) )
+        else:
+            set_node_value( node, "\n".join(lines) )
+
+    # methods that handle the node types that need special treatment,
+    # any other node is handled by the number of configurable values it has
+    _SET_NODE_HANDLERS = {
+        "PrimitiveNode": _set_primitive_node,
+        "Note"         : _set_note_node,
+        }
 
     def set_node(self, node: dict, value):
         """Sets the value of a node.
@@ -469,33 +741,17 @@ class Workflow:
             multiple_values = value
             value           = multiple_values[-1] if len(multiple_values)>0 else ''
 
-        # when encountering a `PrimitiveNode`,
-        # modify the value in the node AND ALL DIRECTLY CONNECTED NODES
-        if get_type(node)=="PrimitiveNode":
-            new_value       = value
-            old_value       = get_values(node)[0]
-            connected_nodes = self.get_all_connected_nodes(node, 0)
-            primitive_name  = get_name(node)
-
-            modify_node_value(node, new_value, old_value)
-            for connected_node in connected_nodes:
-                modify_node_value(connected_node, new_value, old_value,
-                                  node_name=f"'{primitive_name}'->'{get_name(connected_node)}'")
-
-        # when encountering a `Note` node,
-        # the first line of the text will be the title of the note,
-        # the rest of the text will be the content
-        elif get_type(node)=="Note":
-            lines = str(value).splitlines()
-            if len(lines)>1:
-                set_node_title( node, lines[0]             )
-                set_node_value( node, "\n".join(lines[1:]) )
-            else:
-                set_node_value( node, "\n".join(lines) )
+        # (direct dict access is used instead of get_type/get_values
+        #  because this method is called for every configured node)
+        handler = self._SET_NODE_HANDLERS.get( node.get('type', '') )
+        if handler is not None:
+            handler(self, node, value)
+            return
 
         # when encountering a node with only one configurable value,
         # simply set that value
-        elif len(get_values(node))==1:
+        widgets_values = node.get('widgets_values', [])
+        if len(widgets_values)==1:
             set_node_value( node, value )
 
         # for any other node type,
@@ -528,29 +784,96 @@ class Workflow:
         Returns:
             A Workflow object.
         """
-        with open(filename, "r") as f:
-            data = json.load(f)
-            return cls(data)
+        return cls( read_json(filename) )
 
 
-    def save_to_json(self, filename: str):
+    def save_to_json(self, filename: str, indent: int = JSON_INDENT):
         """Saves the workflow to a JSON file.
         Args:
             filename (str): The name of the JSON file.
+            indent   (int): The indentation level, 0 for compact output.
         """
-        with open(filename, "w") as f:
-            json.dump(self.data, f,
-                      indent=(JSON_INDENT if JSON_INDENT>0 else None),
-                      ensure_ascii=False)
+        write_json(filename, self.data, indent=indent)
 
 
     def copy(self):
-        """Creates a copy of the workflow.
+        """Creates a copy of the workflow that can be configured independently.
+
+        Only the structures modified when configuring a workflow are copied
+        (the nodes with their widget values and the groups), the rest of the
+        data, like links, inputs or outputs, is shared with the original and
+        must be treated as read-only.
+
         Returns:
             A new Workflow object with the same data as the original.
         """
-        copied_data = self.data.copy()
-        return Workflow(copied_data)
+        copied_data   = self.data.copy()
+        copied_nodes  = [self._copy_node(node) for node in self.nodes]
+        copied_groups = [group.copy() for group in self.groups]
+        if 'nodes' in copied_data:
+            copied_data['nodes'] = copied_nodes
+        if 'groups' in copied_data:
+            copied_data['groups'] = copied_groups
+
+        # build the copy directly instead of calling `__init__`,
+        # only the index of nodes must be rebuilt because the links are shared,
+        # for the same reason, the connections already resolved are valid for the copy
+        workflow = Workflow.__new__(Workflow)
+        workflow.data        = copied_data
+        workflow.nodes       = copied_nodes
+        workflow.links       = self.links
+        workflow.groups      = copied_groups
+        workflow.nodes_by_id = {node['id']: node for node in copied_nodes if 'id' in node}
+        workflow.links_by_id = self.links_by_id
+        workflow._connected_ids_cache   = self._connected_ids_cache
+        workflow._primitive_plans_cache = {}
+        workflow._template              = self._template or self
+        return workflow
+
+
+    @staticmethod
+    def _copy_node(node: dict) -> dict:
+        """Returns a copy of the node that also owns its list of widget values."""
+        copied_node = node.copy()
+        if 'widgets_values' in copied_node:
+            copied_node['widgets_values'] = copy.copy(node['widgets_values'])
+        return copied_node
+
+
+    def get_primitive_plan(self, node: dict, old_value) -> list:
+        """Returns the nodes connected to a primitive and where its value is in each of them.
+
+        The plan is built from the unmodified nodes of the template this workflow
+        was copied from and stored in that template, so configuring the same
+        primitive in other copies does not need to search the connected nodes again.
+
+        Args:
+            node     (dict): The primitive node.
+            old_value      : The current value of the primitive.
+        Returns:
+            A list of tuples (connected_node, template_values, index), where
+            `template_values` are the widget values of the connected node in the
+            template and `index` is the position of the old value in them, or None
+            if it was not found exactly once (or the workflow is not a copy).
+        """
+        template = self._template
+        if template is None or node.get('id') not in template.nodes_by_id:
+            return [(connected_node, None, None)
+                    for connected_node in self.get_all_connected_nodes(node, 0) or []]
+
+        plan_key = (node['id'], type(old_value), old_value)
+        plan     = template._primitive_plans_cache.get(plan_key)
+        if plan is None:
+            plan = []
+            template_node = template.nodes_by_id[node['id']]
+            for connected_node in template.get_all_connected_nodes(template_node, 0) or []:
+                found_index, found_count = find_node_value(connected_node, old_value)
+                plan.append( (connected_node['id'],
+                              connected_node.get('widgets_values', []),
+                              found_index if found_count == 1 else None) )
+            template._primitive_plans_cache[plan_key] = plan
+        return [(self.nodes_by_id[node_id], template_values, index)
+                for node_id, template_values, index in plan]
 
 
     def get_all_connected_nodes(self, node: dict, output_index: int) -> list:
@@ -562,30 +885,60 @@ class Workflow:
         Returns:
             A list of all connected nodes, including those connected through reroutes.
         """
+        cache_key = (node.get('id'), output_index)
+        connected_ids = self._connected_ids_cache.get(cache_key)
+        if connected_ids is not None:
+            return [self.nodes_by_id[node_id] for node_id in connected_ids]
+
         outputs = node.get('outputs')
         if not outputs or output_index>=len(outputs):
             return None
         output    = outputs[output_index]
-        links_ids = output.get('links',[])
+        links_ids = output.get('links') or []
 
+        # traverse the links using an explicit stack of iterators instead of
+        # recursion, this keeps the nodes in the same (depth-first) order
+        # without being limited by the depth of the reroute chains
         nodes = []
-        for link_id in links_ids:
+        stack = [ iter(links_ids) ]
+        while stack:
+            link_id = next(stack[-1], None)
+            if link_id is None:
+                stack.pop()
+                continue
             link = self.links_by_id[ link_id ]
             # get the node connected to the current link
             connected_node = self.nodes_by_id[ link[3] ]
-            if get_type(connected_node)=="Reroute":
+            if connected_node.get('type')=="Reroute":
                 # if the connected node is a reroute,
-                # recursively get all connected nodes from its output
-                nodes.extend( self.get_all_connected_nodes(connected_node,0) )
+                # continue with all the links from its output
+                reroute_outputs = connected_node.get('outputs') or [{}]
+                stack.append( iter(reroute_outputs[0].get('links') or []) )
             else:
                 # if the connected node is NOT a reroute,
                 # add it to the list
                 nodes.append(connected_node)
+
+        if 'id' in node:
+            self._connected_ids_cache[cache_key] = tuple(connected_node['id'] for connected_node in nodes)
         return nodes
 
 
 #--------------------- CREATING WORKFLOW FROM TEMPLATE ---------------------#
 
+@functools.lru_cache(maxsize=8)
+def load_template(template_filename: str, mtime: float) -> 'Workflow':
+    """Loads a template workflow, caching it between calls.
+    Args:
+        template_filename (str): The path to the JSON template file.
+        mtime           (float): The modification time of the file, only used as
+                                 part of the cache key to reload edited templates.
+    Returns:
+        The template workflow (shared between calls, it must not be modified).
+    """
+    return Workflow.from_json(template_filename)
+
+
 def create_workflow(filename: str,
                     template: Workflow,
                     configs : Configurations) -> Workflow:
@@ -597,73 +950,116 @@ def create_workflow(filename: str,
         warning("Pareciera no haber ningun nodo en el template suministrado")
         return workflow
 
+    # query the configuration only once for each distinct name,
+    # keeping only the names that have a configured value
+    names  = {get_name(node) for node in workflow.nodes} | {get_name(group) for group in workflow.groups}
+    target = os.path.splitext(filename)[0]
+    values_by_name = {}
+    for name in names:
+        value = configs.get_by_target(target, name)
+        if value is not None:
+            values_by_name[name] = value
+
     for node in workflow.nodes:
-        param_name = get_name(node)
-        value      = configs.get(filename, param_name)
+        value = values_by_name.get( get_name(node) )
         if value is not None:
             workflow.set_node( node, value )
 
     for group in workflow.groups:
-        param_name = get_name(group)
-        value      = configs.get(filename, param_name)
+        value = values_by_name.get( get_name(group) )
         if value is not None:
             workflow.set_group( group, value )
 
     return workflow
 
 
-def make(filename: str, configs: Configurations) -> None:
-    """Generates a JSON workflow file based on a template and configuration.
-    Args:
-        filename         (str): The name of the output JSON file.
-        config (Configuration): A object with the configuration values to be applied to the template.
+def get_template_filename(configs: Configurations) -> str:
+    """Returns the filename of the template defined in the configuration.
+    Exits with a fatal error if the template is not defined or does not exist.
     """
-    workflow_filename = filename if os.path.splitext(filename)[1] else filename + '.json'
     template_filename = configs.get_global('TEMPLATE')
-
     if not template_filename:
         fatal_error("No template is defined in the configuration.",
                     "You must define the global variable @TEMPLATE in the configuration.")
     if not os.path.isfile(template_filename):
         fatal_error(f"The template file '{template_filename}' does not exist.",
                     "Check the value assigned to the @TEMPLATE variable.")
+    return template_filename
 
-    # load the JSON template from the file
-    template = Workflow.from_json(template_filename)
+
+def make(filename: str, configs: Configurations, indent: int = JSON_INDENT) -> None:
+    """Generates a JSON workflow file based on a template and configuration.
+    Args:
+        filename         (str): The name of the output JSON file.
+        config (Configuration): A object with the configuration values to be applied to the template.
+        indent           (int): The indentation level of the JSON file, 0 for compact output.
+    """
+    workflow_filename = filename if os.path.splitext(filename)[1] else filename + '.json'
+    template_filename = get_template_filename(configs)
+
+    # load the JSON template from the file (or from the cache if it was already loaded)
+    # the template is shared but `create_workflow` only modifies a copy of it
+    template = load_template(template_filename, os.path.getmtime(template_filename))
 
     message(f"Building '{workflow_filename}'")
     workflow = create_workflow(filename, template, configs)
 
     # Save the JSON workflow to a file
-    workflow.save_to_json(workflow_filename)
+    workflow.save_to_json(workflow_filename, indent=indent)
 
 
-def process(target: str, configs: Configurations) -> None:
+def process(target: str, configs: Configurations, indent: int = JSON_INDENT) -> None:
     """Processes a target based on provided configurations.
     Args:
         target (str): The target to process, can be 'clean', 'all', or a specific filename.
         config (Configuration): A object with the configuration values.
+        indent (int): The indentation level of the generated JSON files, 0 for compact output.
     """
     if target == 'clean':
+        # scan each directory once instead of checking every file separately
+        existing_files = set()
+        for directory in {os.path.dirname(filename) for filename in configs.filenames}:
+            if not os.path.isdir(directory or '.'):
+                continue
+            with os.scandir(directory or '.') as entries:
+                existing_files.update( os.path.join(directory, entry.name)
+                                       for entry in entries if entry.is_file() )
+
         for filename in configs.filenames:
-            if os.path.isfile(filename):
+            if filename in existing_files:
                 message(f"Removing '{filename}'")
                 os.remove(filename)
 
     elif target == 'all':
-        for filename in configs.filenames:
-            make(filename, configs)
+        # each workflow is built independently of the others,
+        # so all of them can be built in parallel
+        # (the template is checked first to report any error only once)
+        get_template_filename(configs)
+        filenames = list(configs.filenames)
+        with ProcessPoolExecutor() as executor:
+            list( executor.map(make, filenames, [configs] * len(filenames), [indent] * len(filenames)) )
 
     else:
-        make(filename, configs)
+        make(target, configs, indent)
 
 
 #===========================================================================#
 #////////////////////////////////// MAIN ///////////////////////////////////#
 #===========================================================================#
 
-def main():
-    global JSON_INDENT
+def parse_args() -> tuple:
+    """Parses the command line arguments.
+    Returns:
+        A tuple (config, indent, targets) where `config` and `indent`
+        are None when they were not provided.
+    """
+    # without options there is nothing to parse but the targets,
+    # so argparse is only imported (and built) when an option is present
+    argv = sys.argv[1:]
+    if not any(arg.startswith('-') for arg in argv):
+        return None, None, argv or ['all']
+
+    import argparse
     parser = argparse.ArgumentParser(
         description="Create workflow files based on the config."
     )
@@ -671,7 +1067,7 @@ def main():
         help="Read FILE as the configurations (default: configurations.txt)"
     )
     parser.add_argument('-i', '--indent', type=int,
-        help=f"Indentation level for the generated JSON files (default: {JSON_INDENT})"
+        help=f"Indentation level for the generated JSON files, 0 writes compact JSON (default: {JSON_INDENT})"
     )
     parser.add_argument('-v', '--version', action='version', version='wmake 0.2',
         help="Show version information and exit."
@@ -681,15 +1077,20 @@ def main():
              "'all' to create all workflow files specified in the config. "
              "'clean' to remove all workflow files specified in the config."
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    return args.config, args.indent, args.target
+
+
+def main():
+    config, indent, targets = parse_args()
 
     # set JSON indentation
-    if args.indent:
-        JSON_INDENT=args.indent
+    if indent is None:
+        indent = JSON_INDENT
 
     # determine the config file path
-    if args.config:
-        configs_path = args.config
+    if config:
+        configs_path = config
     elif os.path.exists(DEFAULT_CONFIGS_NAME):
         configs_path = DEFAULT_CONFIGS_NAME
     else:
@@ -705,8 +1106,8 @@ def main():
     configs = Configurations.from_file(configs_path)
 
      # process each target
-    for target in args.target:
-        process(target, configs)
+    for target in targets:
+        process(target, configs, indent)
 
 
 if __name__ == "__main__":